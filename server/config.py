@@ -23,10 +23,15 @@ class ServerConfig:
     # ── Authentication ───────────────────────────────────────
     # Password is set on first run or via env var
     password_hash: str = ""
-    jwt_secret: str = field(default_factory=lambda: secrets.token_hex(32))
+    # Resolved lazily by the jwt_secret property — see below
+    _jwt_secret: str = ""
     jwt_expiry_hours: int = 24
     max_login_attempts: int = 5
     lockout_duration_seconds: int = 300  # 5 minutes
+    # bcrypt work factor. 12 is ~250-400ms per hash; lowering it is a
+    # reasonable trade on weak hardware since rate limiting + lockout
+    # already bound online guessing. Clamped to 8-14.
+    bcrypt_rounds: int = 12
 
     # ── Screen Capture ───────────────────────────────────────
     capture_fps: int = 15
@@ -64,6 +69,38 @@ class ServerConfig:
     )
     password_file: str = "password.hash"
 
+    @property
+    def jwt_secret(self) -> str:
+        """
+        JWT signing secret, resolved on first access:
+        DSK_JWT_SECRET env var, then data_dir/jwt.secret, then a fresh
+        random value persisted there. Lazy so instantiating a config
+        never touches /dev/urandom, and persisted so a server restart
+        doesn't invalidate every active session.
+        """
+        if not self._jwt_secret:
+            env_secret = os.getenv("DSK_JWT_SECRET")
+            if env_secret:
+                self._jwt_secret = env_secret
+                return self._jwt_secret
+
+            secret_path = Path(self.data_dir) / "jwt.secret"
+            try:
+                self._jwt_secret = secret_path.read_text().strip()
+            except OSError:
+                pass
+
+            if not self._jwt_secret:
+                self._jwt_secret = secrets.token_hex(32)
+                try:
+                    secret_path.parent.mkdir(parents=True, exist_ok=True)
+                    secret_path.write_text(self._jwt_secret)
+                    secret_path.chmod(0o600)
+                except OSError:
+                    pass  # keep the in-memory secret for this run
+
+        return self._jwt_secret
+
     @property
     def cert_path(self) -> Path:
         return Path(self.cert_dir) / self.cert_file
@@ -100,6 +137,9 @@ class ServerConfig:
         config.jwt_expiry_hours = int(
             os.getenv("DSK_JWT_EXPIRY", str(config.jwt_expiry_hours))
         )
+        config.bcrypt_rounds = max(8, min(14, int(
+            os.getenv("DSK_BCRYPT_ROUNDS", str(config.bcrypt_rounds))
+        )))
 
         env_dirs = os.getenv("DSK_ALLOWED_DIRS")
         if env_dirs:
@@ -5,20 +5,79 @@ Handles file browsing, upload, and download with path security.
 """
 
 import os
+import re
+import stat
+import time
+import bisect
 import shutil
+import functools
 import mimetypes
 from pathlib import Path
 from typing import Optional, List
-from datetime import datetime
 
 from config import config
 
+# Listing timestamps only need second resolution; time.strftime is
+# implemented in C and avoids a datetime allocation per entry.
+_ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+
+
+# Suffixes guess_type treats as encodings, not types (.gz, .bz2, ...);
+# for names like archive.tar.gz the preceding extension carries the type.
+_ENCODING_EXTS = frozenset(k.lower() for k in mimetypes.encodings_map)
+
+
+@functools.lru_cache(maxsize=1024)
+def _mime_for_ext(ext: str) -> Optional[str]:
+    """
+    Memoized MIME lookup keyed by lowercased extension.
+    A listing has far fewer unique extensions than files, so this keeps
+    guess_type's string parsing out of the per-entry loop.
+    """
+    return mimetypes.guess_type("x" + ext)[0]
+
+
+def _mime_for_name(name: str) -> Optional[str]:
+    """
+    Feed the last extension — or the last two when the final one is an
+    encoding suffix — into the memoized lookup, matching what
+    guess_type(name) would return for compound names like .tar.gz.
+    """
+    root, ext = os.path.splitext(name)
+    if ext.lower() in _ENCODING_EXTS:
+        ext = os.path.splitext(root)[1] + ext
+    return _mime_for_ext(ext.lower())
+
 
 class FileManager:
     """Secure file manager for browsing, uploading, and downloading."""
 
     def __init__(self):
         mimetypes.init()
+        # Resolve allowed roots once — resolve() is a syscall chain we
+        # don't want to repeat per request. Each root keeps a trailing
+        # separator so prefix checks can't match sibling directories
+        # (e.g. /home/user2 when /home/user is allowed).
+        self._allowed_roots = tuple(
+            str(Path(d).resolve()) + os.sep
+            for d in config.allowed_directories
+        )
+        # Sorted copy for O(log D) longest-prefix probes when many
+        # roots are configured (DSK_ALLOWED_DIRS with share lists).
+        self._sorted_roots = tuple(sorted(self._allowed_roots))
+
+    def _is_path_allowed_resolved(self, resolved: str) -> bool:
+        """Check an already-resolved path string against the allowed roots."""
+        # Appending the separator makes "path equals root" and "path is
+        # under root" the same prefix test.
+        key = resolved + os.sep
+        i = bisect.bisect_right(self._sorted_roots, key) - 1
+        if i >= 0 and key.startswith(self._sorted_roots[i]):
+            return True
+        # A nested sibling root can sort between a shorter matching
+        # root and the key, hiding it from the bisect probe — settle
+        # those (and genuine misses) with the linear scan.
+        return any(key.startswith(r) for r in self._allowed_roots)
 
     def _is_path_allowed(self, path: str) -> bool:
         """
@@ -26,11 +85,7 @@ class FileManager:
         Prevents path traversal attacks.
         """
         try:
-            resolved = Path(path).resolve()
-            return any(
-                str(resolved).startswith(str(Path(d).resolve()))
-                for d in config.allowed_directories
-            )
+            return self._is_path_allowed_resolved(str(Path(path).resolve()))
         except (ValueError, OSError):
             return False
 
@@ -40,7 +95,7 @@ class FileManager:
         """
         try:
             resolved = Path(path).resolve()
-            if not self._is_path_allowed(str(resolved)):
+            if not self._is_path_allowed_resolved(str(resolved)):
                 return None
             return resolved
         except (ValueError, OSError):
@@ -60,42 +115,57 @@ class FileManager:
         if not safe_path.is_dir():
             return {"error": "Not a directory"}
 
-        items = []
+        # os.scandir DirEntry objects cache type/stat info from the
+        # directory read itself, avoiding the extra stat(2) per file
+        # that Path.iterdir + entry.stat() would issue.
         try:
-            for entry in sorted(safe_path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower())):
-                try:
-                    stat = entry.stat()
-                    items.append({
-                        "name": entry.name,
-                        "path": str(entry),
-                        "is_dir": entry.is_dir(),
-                        "size": stat.st_size if entry.is_file() else 0,
-                        "modified": datetime.fromtimestamp(
-                            stat.st_mtime
-                        ).isoformat(),
-                        "mime_type": (
-                            mimetypes.guess_type(entry.name)[0]
-                            if entry.is_file()
-                            else "inode/directory"
-                        ),
-                    })
-                except (PermissionError, OSError):
-                    # Skip files we can't access
-                    items.append({
-                        "name": entry.name,
-                        "path": str(entry),
-                        "is_dir": entry.is_dir(),
-                        "size": 0,
-                        "modified": "",
-                        "mime_type": "unknown",
-                        "error": "Permission denied",
-                    })
+            with os.scandir(safe_path) as it:
+                entries = list(it)
         except PermissionError:
             return {"error": "Permission denied"}
 
-        # Determine parent path (if within allowed dirs)
+        entries.sort(
+            key=lambda e: (not e.is_dir(), e.name.lower())
+        )
+
+        items = []
+        for entry in entries:
+            try:
+                # Follow symlinks so a link to a directory browses as
+                # one; DirEntry caches the result either way, so the
+                # extra stat(2) only happens for the links themselves.
+                st = entry.stat()
+                is_dir = entry.is_dir()
+                items.append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "is_dir": is_dir,
+                    "size": 0 if is_dir else st.st_size,
+                    "modified": time.strftime(
+                        _ISO_FMT, time.localtime(st.st_mtime)
+                    ),
+                    "mime_type": (
+                        "inode/directory"
+                        if is_dir
+                        else _mime_for_name(entry.name)
+                    ),
+                })
+            except (PermissionError, OSError):
+                # Skip files we can't access
+                items.append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "is_dir": False,
+                    "size": 0,
+                    "modified": "",
+                    "mime_type": "unknown",
+                    "error": "Permission denied",
+                })
+
+        # Determine parent path (if within allowed dirs).
+        # safe_path is already resolved, so its parent is too.
         parent = str(safe_path.parent)
-        if not self._is_path_allowed(parent):
+        if not self._is_path_allowed_resolved(parent):
             parent = None
 
         return {
@@ -111,24 +181,28 @@ class FileManager:
         if safe_path is None:
             return {"error": "Access denied or invalid path"}
 
-        if not safe_path.exists():
-            return {"error": "File not found"}
-
+        # One stat covers existence, type, size, and mtime; safe_path
+        # is already fully resolved so lstat semantics are equivalent.
         try:
-            stat = safe_path.stat()
-            return {
-                "name": safe_path.name,
-                "path": str(safe_path),
-                "is_dir": safe_path.is_dir(),
-                "size": stat.st_size,
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "mime_type": mimetypes.guess_type(safe_path.name)[0],
-                "readable": os.access(safe_path, os.R_OK),
-                "writable": os.access(safe_path, os.W_OK),
-            }
+            st = os.stat(safe_path, follow_symlinks=False)
+        except FileNotFoundError:
+            return {"error": "File not found"}
         except (PermissionError, OSError) as e:
             return {"error": str(e)}
 
+        return {
+            "name": safe_path.name,
+            "path": str(safe_path),
+            "is_dir": stat.S_ISDIR(st.st_mode),
+            "size": st.st_size,
+            "modified": time.strftime(
+                _ISO_FMT, time.localtime(st.st_mtime)
+            ),
+            "mime_type": _mime_for_name(safe_path.name),
+            "readable": os.access(safe_path, os.R_OK),
+            "writable": os.access(safe_path, os.W_OK),
+        }
+
     def validate_download(self, path: str) -> tuple:
         """
         Validate a file can be downloaded.
@@ -140,12 +214,22 @@ class FileManager:
         if safe_path is None:
             return None, "Access denied or invalid path"
 
-        if not safe_path.exists():
+        # Existence and file-type checks from a single stat
+        try:
+            st = os.stat(safe_path, follow_symlinks=False)
+        except FileNotFoundError:
             return None, "File not found"
+        except OSError:
+            return None, "Permission denied"
 
-        if not safe_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return None, "Not a file"
 
+        # Fast readability hint: our own file with the owner-read bit
+        # set needs no access(2) call; anything else gets the full check.
+        if st.st_uid == os.getuid() and st.st_mode & stat.S_IRUSR:
+            return safe_path, None
+
         if not os.access(safe_path, os.R_OK):
             return None, "Permission denied"
 
@@ -171,14 +255,28 @@ class FileManager:
 
         target = target_dir / safe_name
 
-        # If file exists, add a suffix
-        if target.exists():
+        # If file exists, add a suffix. A single directory scan for the
+        # highest existing "_N" counter avoids one stat per candidate
+        # name (O(N^2) stats across an upload burst of same-named files).
+        try:
+            os.stat(target)
+            exists = True
+        except FileNotFoundError:
+            exists = False
+
+        if exists:
             stem = target.stem
             suffix = target.suffix
-            counter = 1
-            while target.exists():
-                target = target_dir / f"{stem}_{counter}{suffix}"
-                counter += 1
+            pattern = re.compile(
+                r"^" + re.escape(stem) + r"_(\d+)" + re.escape(suffix) + r"$"
+            )
+            highest = 0
+            with os.scandir(target_dir) as it:
+                for entry in it:
+                    match = pattern.match(entry.name)
+                    if match:
+                        highest = max(highest, int(match.group(1)))
+            target = target_dir / f"{stem}_{highest + 1}{suffix}"
 
         return str(target), None
 
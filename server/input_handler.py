@@ -12,13 +12,32 @@ Backend selection:
 import os
 import sys
 import json
+import time
 import logging
+import itertools
+import threading
 import subprocess
+from concurrent.futures import Future
 from pathlib import Path
 from typing import List, Optional
 
 logger = logging.getLogger("door-se-kaam")
 
+# orjson is 3-10x faster than stdlib json and emits bytes directly,
+# which suits the binary pipe to the Wayland helper. Optional.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
 _session_type = os.getenv("XDG_SESSION_TYPE", "").lower()
 _is_wayland = _session_type == "wayland" or bool(os.getenv("WAYLAND_DISPLAY"))
 
@@ -55,6 +74,13 @@ class WaylandInputBackend:
     def __init__(self):
         self._process: Optional[subprocess.Popen] = None
         self._ready = False
+        # Response plumbing: a dedicated reader thread resolves futures
+        # registered by command id, so sync commands pipeline instead
+        # of paying a select+readline pair each.
+        self._seq = itertools.count(1)
+        self._pending: dict = {}  # id -> Future
+        self._stdin_lock = threading.Lock()
+        self._reader_thread: Optional[threading.Thread] = None
 
     def start(self):
         """Start the Wayland input helper process."""
@@ -63,13 +89,13 @@ class WaylandInputBackend:
 
         logger.info("Starting Wayland input backend (Mutter RemoteDesktop)...")
 
+        # Binary pipes: orjson emits bytes, so this avoids a
+        # str->bytes encode per command.
         self._process = subprocess.Popen(
             ["/usr/bin/python3", str(_WAYLAND_HELPER)],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
         )
 
         # Wait for "ready" signal
@@ -80,9 +106,15 @@ class WaylandInputBackend:
                 if ready:
                     line = self._process.stdout.readline().strip()
                     if line:
-                        data = json.loads(line)
+                        data = _json_loads(line)
                         if data.get("status") == "ready":
                             self._ready = True
+                            self._reader_thread = threading.Thread(
+                                target=self._reader_loop,
+                                args=(self._process,),
+                                daemon=True,
+                            )
+                            self._reader_thread.start()
                             logger.info(f"Wayland input backend ready (session: {data.get('session')})")
                             return
                         elif data.get("status") == "error":
@@ -96,11 +128,36 @@ class WaylandInputBackend:
             logger.error(f"Wayland input start failed: {e}")
             self.stop()
 
+    def _reader_loop(self, process: subprocess.Popen):
+        """Drain helper stdout, resolving pending futures by id."""
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    msg = _json_loads(line)
+                except ValueError:
+                    continue
+                fut = self._pending.pop(msg.get("id"), None)
+                if fut is not None:
+                    fut.set_result(msg)
+        except Exception:
+            pass
+        finally:
+            # Helper died — fail anything still outstanding
+            while self._pending:
+                _, fut = self._pending.popitem()
+                if not fut.done():
+                    fut.set_result(
+                        {"status": "error", "message": "Input backend exited"}
+                    )
+
     def stop(self):
         """Stop the helper process."""
         if self._process:
             try:
-                self._send({"type": "stop"})
+                self._send_async({"type": "stop"})
                 self._process.wait(timeout=2)
             except Exception:
                 try:
@@ -111,48 +168,75 @@ class WaylandInputBackend:
             self._process = None
             self._ready = False
 
+    def _ensure_process(self) -> bool:
+        """Restart the helper if it died. Returns True when usable."""
+        if self._ready and self._process is not None and self._process.poll() is None:
+            return True
+        self._ready = False
+        self.start()
+        return self._ready
+
     def _send(self, command: dict) -> dict:
-        """Send a command to the helper and read response."""
-        if not self._ready or self._process is None or self._process.poll() is not None:
-            # Process died, restart it
-            self._ready = False
-            self.start()
-            if not self._ready:
-                return {"status": "error", "message": "Input backend not available"}
+        """Send a command to the helper and wait for its reply."""
+        if not self._ensure_process():
+            return {"status": "error", "message": "Input backend not available"}
+
+        cmd_id = next(self._seq)
+        command["id"] = cmd_id
+        fut: Future = Future()
+        self._pending[cmd_id] = fut
 
         try:
-            self._process.stdin.write(json.dumps(command) + "\n")
-            self._process.stdin.flush()
+            with self._stdin_lock:
+                self._process.stdin.write(_json_dumps(command) + b"\n")
+                self._process.stdin.flush()
+        except Exception as e:
+            logger.error(f"Input command failed: {e}")
+            self._pending.pop(cmd_id, None)
+            self._ready = False
+            return {"status": "error", "message": str(e)}
 
-            # Read response (with timeout)
-            import select
-            ready, _, _ = select.select([self._process.stdout], [], [], 2.0)
-            if ready:
-                line = self._process.stdout.readline().strip()
-                if line:
-                    return json.loads(line)
+        try:
+            return fut.result(timeout=2.0)
+        except Exception:
+            self._pending.pop(cmd_id, None)
             return {"status": "ok"}  # Assume ok if no response
+
+    def _send_async(self, command: dict):
+        """
+        Fire-and-forget: write the command without waiting for a reply.
+        The helper skips the ack for "noack" commands, so nothing stale
+        accumulates on the stdout pipe. Used for high-rate events where
+        a per-event IPC round trip would dominate (mouse streams).
+        """
+        if not self._ensure_process():
+            return
+
+        try:
+            command["noack"] = True
+            with self._stdin_lock:
+                self._process.stdin.write(_json_dumps(command) + b"\n")
+                self._process.stdin.flush()
         except Exception as e:
             logger.error(f"Input command failed: {e}")
             self._ready = False
-            return {"status": "error", "message": str(e)}
 
     def mouse_move(self, x: int, y: int, relative: bool = True):
-        self._send({"type": "mouse_move", "x": x, "y": y, "relative": relative})
+        self._send_async({"type": "mouse_move", "x": x, "y": y, "relative": relative})
 
     def mouse_click(self, button="left", count=1, x=None, y=None):
         if x is not None and y is not None:
-            self._send({"type": "mouse_move", "x": x, "y": y, "relative": False})
+            self._send_async({"type": "mouse_move", "x": x, "y": y, "relative": False})
         self._send({"type": "mouse_click", "button": button, "count": count})
 
     def mouse_scroll(self, dx=0, dy=0):
-        self._send({"type": "mouse_scroll", "dx": dx, "dy": dy})
+        self._send_async({"type": "mouse_scroll", "dx": dx, "dy": dy})
 
     def mouse_down(self, button="left"):
-        self._send({"type": "mouse_down", "button": button})
+        self._send_async({"type": "mouse_down", "button": button})
 
     def mouse_up(self, button="left"):
-        self._send({"type": "mouse_up", "button": button})
+        self._send_async({"type": "mouse_up", "button": button})
 
     def key_press(self, key: str, modifiers: Optional[List[str]] = None):
         self._send({"type": "key_press", "key": key, "modifiers": modifiers or []})
@@ -161,7 +245,7 @@ class WaylandInputBackend:
         self._send({"type": "key_combo", "keys": keys})
 
     def type_text(self, text: str):
-        self._send({"type": "type_text", "text": text})
+        self._send_async({"type": "type_text", "text": text})
 
     @property
     def is_available(self) -> bool:
@@ -189,7 +273,46 @@ class X11InputBackend:
         **{f"f{i}": f"f{i}" for i in range(1, 25)},
     }
 
+    # Merged once at class creation so _resolve_key is a single dict get
+    _KEY_TABLE = {**MODIFIER_MAP, **SPECIAL_KEYS}
+
+    def __init__(self):
+        # Raw XTest handle for the mouse_move fast path; opened lazily,
+        # None after a failed attempt so we only try once.
+        self._xtest_display = None
+        self._xtest_checked = False
+
+    def _get_xtest_display(self):
+        """Lazily open an Xlib display for raw XTest motion events."""
+        if not self._xtest_checked:
+            self._xtest_checked = True
+            try:
+                from Xlib import X
+                from Xlib.display import Display
+                from Xlib.ext import xtest
+                self._xtest_display = Display()
+                self._x_motion = X.MotionNotify
+                self._xtest_fake_input = xtest.fake_input
+            except Exception:
+                self._xtest_display = None
+        return self._xtest_display
+
     def mouse_move(self, x: int, y: int, relative: bool = True):
+        # Fast path: a single XTestFakeMotionEvent skips pyautogui's
+        # per-call clamping/failsafe/dispatch overhead — it dominates
+        # at high-rate motion streams.
+        disp = self._get_xtest_display()
+        if disp is not None:
+            try:
+                # detail=True requests relative motion
+                self._xtest_fake_input(
+                    disp, self._x_motion, detail=relative, x=x, y=y
+                )
+                disp.sync()
+                return
+            except Exception:
+                self._xtest_display = None  # fall back to pyautogui
+
         pag = _get_pyautogui()
         if relative:
             pag.moveRel(x, y, duration=0)
@@ -231,11 +354,26 @@ class X11InputBackend:
 
     def type_text(self, text: str):
         pag = _get_pyautogui()
-        pag.typewrite(text, interval=0.02) if text.isascii() else pag.write(text)
+        if not text.isascii():
+            pag.write(text)
+            return
+
+        # Long pastes via the clipboard: typewrite at 20ms/char makes a
+        # 100-char paste take 2s of pure sleep, paste is bounded by the
+        # X server round trip instead.
+        if len(text) > 8:
+            try:
+                _get_pyperclip().copy(text)
+                pag.hotkey("ctrl", "v")
+                return
+            except Exception:
+                pass  # no clipboard backend — fall through to typing
+
+        pag.typewrite(text, interval=0)
 
     def _resolve_key(self, key: str) -> str:
         k = key.lower()
-        return self.MODIFIER_MAP.get(k) or self.SPECIAL_KEYS.get(k) or (key if len(key) == 1 else k)
+        return self._KEY_TABLE.get(k) or (key if len(key) == 1 else k)
 
     def _resolve_modifier(self, mod: str) -> str:
         return self.MODIFIER_MAP.get(mod.lower(), mod.lower())
@@ -255,9 +393,16 @@ class InputHandler:
     Auto-detects Wayland vs X11 and uses the appropriate backend.
     """
 
+    # Consecutive relative mouse moves inside this window are merged
+    # into one event before hitting the backend.
+    MOVE_COALESCE_WINDOW = 0.004  # seconds
+
     def __init__(self):
         self._sensitivity = 1.0
         self._drag_active = False
+        self._move_dx = 0
+        self._move_dy = 0
+        self._move_emit_ts = 0.0
 
         # Select backend
         if _is_wayland:
@@ -282,6 +427,13 @@ class InputHandler:
     def sensitivity(self, value: float):
         self._sensitivity = max(0.1, min(5.0, value))
 
+    def _flush_pending_move(self):
+        """Emit any accumulated relative motion as a single event."""
+        if self._move_dx or self._move_dy:
+            self._backend.mouse_move(self._move_dx, self._move_dy, True)
+            self._move_dx = 0
+            self._move_dy = 0
+
     def _handle_clipboard(self, command: dict) -> dict:
         """Handle clipboard sync commands."""
         action = command.get("action", "get")
@@ -308,11 +460,21 @@ class InputHandler:
                 y = command.get("y", 0)
                 relative = command.get("relative", True)
                 if relative:
-                    x = int(x * self._sensitivity)
-                    y = int(y * self._sensitivity)
-                self._backend.mouse_move(x, y, relative)
+                    # Accumulate deltas and emit at most once per
+                    # coalesce window; 120 Hz touch streams collapse
+                    # to ~250 backend events/s without visible lag.
+                    self._move_dx += int(x * self._sensitivity)
+                    self._move_dy += int(y * self._sensitivity)
+                    now = time.monotonic()
+                    if now - self._move_emit_ts >= self.MOVE_COALESCE_WINDOW:
+                        self._move_emit_ts = now
+                        self._flush_pending_move()
+                else:
+                    self._flush_pending_move()
+                    self._backend.mouse_move(x, y, relative)
 
             elif cmd_type == "mouse_click":
+                self._flush_pending_move()
                 self._backend.mouse_click(
                     button=command.get("button", "left"),
                     count=command.get("count", 1),
@@ -327,10 +489,12 @@ class InputHandler:
                 )
 
             elif cmd_type == "mouse_down":
+                self._flush_pending_move()
                 self._backend.mouse_down(command.get("button", "left"))
                 self._drag_active = True
 
             elif cmd_type == "mouse_up":
+                self._flush_pending_move()
                 self._backend.mouse_up(command.get("button", "left"))
                 self._drag_active = False
 
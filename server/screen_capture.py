@@ -11,12 +11,17 @@ Supports multiple backends (auto-detected):
 
 import io
 import os
+import re
 import sys
 import time
 import asyncio
 import subprocess
 import tempfile
 import logging
+import shutil
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, AsyncGenerator, List
 
@@ -24,14 +29,79 @@ from PIL import Image
 
 from config import config
 
+# libjpeg-turbo (via PyTurboJPEG) for the hot encode path: its SIMD DCT
+# and Huffman coding are several times faster than Pillow's bundled
+# libjpeg on multi-megapixel frames. Optional, PIL encoder as fallback.
+try:
+    import numpy as _np
+    from turbojpeg import (
+        TurboJPEG,
+        TJPF_BGR,
+        TJPF_BGRX,
+        TJSAMP_420,
+        TJFLAG_FASTDCT,
+    )
+
+    _turbojpeg_available = True
+except ImportError:
+    _turbojpeg_available = False
+
+_tj = None
+
+
+def _get_turbojpeg():
+    """Lazily construct the shared TurboJPEG encoder (None if unavailable)."""
+    global _tj, _turbojpeg_available
+    if _tj is None and _turbojpeg_available:
+        try:
+            _tj = TurboJPEG()
+        except (OSError, RuntimeError):
+            # Binding importable but libturbojpeg itself missing
+            _turbojpeg_available = False
+    return _tj
+
 logger = logging.getLogger("door-se-kaam")
 
+# Change detection: hash every 64th byte of the raw BGRA buffer (a few
+# hundred KB of CRC against a tens-of-MB frame) and skip the JPEG
+# encode when nothing moved. A full frame is still forced periodically
+# so a hash collision or missed delta can't freeze the stream.
+_HASH_STRIDE = 64
+_KEYFRAME_INTERVAL = 1.0  # seconds
+
+# Sentinel returned by _grab_jpeg when the screen content is unchanged
+_UNCHANGED = b""
+
+
+def _boost_capture_thread():
+    """
+    Encode-pool initializer: request round-robin realtime scheduling so
+    background CPU load doesn't preempt the capture thread mid-frame —
+    which the adaptive logic would misread as slow encoding and answer
+    by downshifting FPS. Unprivileged processes (no CAP_SYS_NICE) fall
+    back to a niceness bump, and failing that run at default priority.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(10))
+        logger.debug("Capture thread using SCHED_RR")
+        return
+    except (OSError, AttributeError):
+        pass
+    try:
+        os.nice(-5)
+        logger.debug("Capture thread niceness raised")
+    except OSError:
+        logger.debug("Capture thread at default priority")
+
 _session_type = os.getenv("XDG_SESSION_TYPE", "").lower()
 _is_wayland = _session_type == "wayland" or bool(os.getenv("WAYLAND_DISPLAY"))
 
 # Path to the wayland helper script (runs with system python for gi)
 _HELPER_SCRIPT = Path(__file__).parent / "wayland_capture.py"
 
+# xrandr geometry: "1920x1080+0+0" → width, height, left, top
+_MON_RE = re.compile(r"(\d+)x(\d+)\+(\d+)\+(\d+)")
+
 
 class ScreenCapture:
     """Fast screen capture with JPEG encoding for streaming."""
@@ -47,22 +117,60 @@ class ScreenCapture:
         self.monitor = monitor if monitor is not None else config.capture_monitor
         self._running = False
 
-        # Adaptive tracking (only FPS adapts, quality stays fixed)
-        self._frame_times: list = []
+        # Adaptive tracking (only FPS adapts, quality stays fixed).
+        # deque evicts in O(1); the old list was re-sliced every frame.
+        self._frame_times: deque = deque(maxlen=30)
         self._adaptive_quality = self.quality
         self._adaptive_fps = self.fps
 
+        # Unchanged-frame detection state
+        self._last_frame_hash: Optional[int] = None
+        self._last_keyframe_ts = 0.0
+
+        # TurboJPEG bound method + static kwargs, hoisted on first use
+        self._tj_encode = None
+        self._tj_kwargs: Optional[dict] = None
+
+        # Monitor list, enumerated once (see get_monitors)
+        self._monitors_cache: Optional[List[dict]] = None
+
         # Wayland PipeWire session state
         self._pw_node_id: Optional[int] = None
         self._pw_session_proc: Optional[subprocess.Popen] = None
+        # False when the helper has no GStreamer bindings and frames
+        # must fall back to one-shot gst-launch invocations.
+        self._pw_grab_ok = True
         self._tmp_file = Path(tempfile.gettempdir()) / "dsk_screenshot.jpg"
 
+        # Persistent mss handle, created lazily on first grab so the
+        # X connection is made where capture actually runs.
+        self._sct = None
+
+        # Capture+encode runs on this single worker so the blocking
+        # C code (mss grab, libjpeg) never stalls the event loop; one
+        # worker also keeps the mss handle on a single thread.
+        self._encode_pool = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="dsk-capture",
+            initializer=_boost_capture_thread,
+        )
+
         # Detect backend
         self._backend = self._detect_backend()
         logger.info(f"Screen capture backend: {self._backend} (session: {_session_type})")
 
+    # Cached across instances — the session type and installed tools
+    # can't change within the process lifetime, and detection costs a
+    # gdbus round-trip plus PATH walks.
+    _detected_backend: Optional[str] = None
+
     def _detect_backend(self) -> str:
         """Detect the best available screenshot backend."""
+        if ScreenCapture._detected_backend is None:
+            ScreenCapture._detected_backend = self._probe_backend()
+        return ScreenCapture._detected_backend
+
+    def _probe_backend(self) -> str:
         if _is_wayland:
             try:
                 result = subprocess.run(
@@ -85,11 +193,9 @@ class ScreenCapture:
         return "mss"
 
     def _cmd_exists(self, cmd: str) -> bool:
-        try:
-            subprocess.run(["which", cmd], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        # PATH walk in-process; forking /usr/bin/which cost ~5-10 ms
+        # per probed tool.
+        return shutil.which(cmd) is not None
 
     def _start_pipewire_session(self):
         """Start a persistent ScreenCast D-Bus session via the helper."""
@@ -98,30 +204,60 @@ class ScreenCapture:
 
         logger.info("Starting PipeWire ScreenCast session...")
 
+        # Binary pipes: after the NODE/SESSION handshake the helper
+        # streams length-prefixed JPEG frames over stdout.
         self._pw_session_proc = subprocess.Popen(
             ["/usr/bin/python3", str(_HELPER_SCRIPT), "session"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
         )
 
         try:
-            for _ in range(10):
-                line = ""
-                import select
-                ready, _, _ = select.select([self._pw_session_proc.stdout], [], [], 0.5)
-                if ready:
-                    line = self._pw_session_proc.stdout.readline().strip()
-
-                if line.startswith("NODE:"):
-                    self._pw_node_id = int(line.split(":")[1])
-                    logger.info(f"PipeWire node ID: {self._pw_node_id}")
-                    break
-                elif line.startswith("ERROR:"):
-                    logger.error(f"PipeWire session error: {line}")
-                    self._stop_pipewire_session()
-                    return
+            # One shared 5s deadline with a non-blocking drain. The old
+            # loop ran up to 10 select+readline rounds at a fixed 500ms
+            # apiece, waking once per line; this wakes when bytes
+            # arrive and parses every buffered line in the same pass.
+            # The handshake ends at the SESSION line so no partial
+            # leftovers can desynchronize the frame protocol.
+            import selectors
+
+            fd = self._pw_session_proc.stdout.fileno()
+            os.set_blocking(fd, False)
+            sel = selectors.DefaultSelector()
+            sel.register(fd, selectors.EVENT_READ)
+            buf = bytearray()
+            deadline = time.monotonic() + 5.0
+            done = False
+            try:
+                while not done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not sel.select(remaining):
+                        break
+                    try:
+                        chunk = os.read(fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        break  # helper exited
+                    buf += chunk
+                    while b"\n" in buf:
+                        line_b, _, buf = buf.partition(b"\n")
+                        line = bytes(line_b).decode("utf-8", "replace").strip()
+                        if line.startswith("NODE:"):
+                            self._pw_node_id = int(line.split(":")[1])
+                            logger.info(f"PipeWire node ID: {self._pw_node_id}")
+                        elif line.startswith("SESSION:"):
+                            done = True
+                            break
+                        elif line.startswith("ERROR:"):
+                            logger.error(f"PipeWire session error: {line}")
+                            self._stop_pipewire_session()
+                            return
+            finally:
+                sel.close()
+                if self._pw_session_proc is not None:
+                    os.set_blocking(fd, True)
 
             if self._pw_node_id is None:
                 logger.error("Failed to get PipeWire node ID")
@@ -134,7 +270,7 @@ class ScreenCapture:
         """Stop the PipeWire ScreenCast session."""
         if self._pw_session_proc:
             try:
-                self._pw_session_proc.stdin.write("stop\n")
+                self._pw_session_proc.stdin.write(b"stop\n")
                 self._pw_session_proc.stdin.flush()
                 self._pw_session_proc.wait(timeout=3)
             except Exception:
@@ -147,7 +283,25 @@ class ScreenCapture:
             self._pw_node_id = None
 
     def get_monitors(self) -> List[dict]:
-        """Return list of available monitors."""
+        """
+        Return list of available monitors. Cached for the process
+        lifetime — enumeration costs an X round-trip or an xrandr
+        fork per call and hotplug is rare; refresh_monitors() drops
+        the cache when topology does change.
+        """
+        if self._monitors_cache is None:
+            self._monitors_cache = self._enumerate_monitors()
+        return self._monitors_cache
+
+    def refresh_monitors(self) -> None:
+        """
+        Drop the cached monitor list after a topology change; the
+        next get_monitors() re-enumerates. Lazy so callers on the
+        event loop don't pay the xrandr fork inline.
+        """
+        self._monitors_cache = None
+
+    def _enumerate_monitors(self) -> List[dict]:
         if self._backend == "mss":
             try:
                 import mss
@@ -174,20 +328,20 @@ class ScreenCapture:
                 monitors = [{"index": 0, "left": 0, "top": 0, "width": 0, "height": 0, "is_combined": True}]
                 idx = 1
                 for line in result.stdout.splitlines():
-                    if " connected " in line:
-                        for part in line.split():
-                            if "x" in part and "+" in part:
-                                dims = part.split("+")[0]
-                                w, h = dims.split("x")
-                                monitors.append({
-                                    "index": idx, "left": 0, "top": 0,
-                                    "width": int(w), "height": int(h),
-                                    "is_combined": False,
-                                })
-                                monitors[0]["width"] = max(monitors[0]["width"], int(w))
-                                monitors[0]["height"] = max(monitors[0]["height"], int(h))
-                                idx += 1
-                                break
+                    if " connected " not in line:
+                        continue
+                    m = _MON_RE.search(line)
+                    if not m:
+                        continue
+                    w, h, left, top = map(int, m.groups())
+                    monitors.append({
+                        "index": idx, "left": left, "top": top,
+                        "width": w, "height": h,
+                        "is_combined": False,
+                    })
+                    monitors[0]["width"] = max(monitors[0]["width"], w)
+                    monitors[0]["height"] = max(monitors[0]["height"], h)
+                    idx += 1
                 return monitors
         except Exception:
             pass
@@ -202,20 +356,190 @@ class ScreenCapture:
     ) -> bytes:
         """Capture a single frame as JPEG bytes."""
         q = quality or self._adaptive_quality
-        img = self._capture_image()
+        frame = self._grab_jpeg(q, max_width)
 
-        if img is None:
+        if frame is None:
             img = Image.new("RGB", (640, 480), (30, 30, 50))
+            buf = io.BytesIO()
+            img.save(
+                buf, format="JPEG", quality=q, optimize=False,
+                subsampling=2, progressive=False,
+            )
+            frame = buf.getvalue()
+
+        return frame
+
+    def _is_unchanged(self, buf) -> bool:
+        """
+        True when a strided CRC of the raw frame matches the previous
+        one and a keyframe was emitted recently — the caller may then
+        skip the encode entirely (idle desktop, paused video).
+        """
+        h = zlib.crc32(bytes(memoryview(buf)[::_HASH_STRIDE]))
+        now = time.monotonic()
+        if (
+            h == self._last_frame_hash
+            and now - self._last_keyframe_ts < _KEYFRAME_INTERVAL
+        ):
+            return True
+        self._last_frame_hash = h
+        self._last_keyframe_ts = now
+        return False
+
+    def _grab_jpeg(
+        self,
+        quality: int,
+        max_width: int = None,
+        allow_skip: bool = False,
+    ) -> Optional[bytes]:
+        """
+        Capture one frame and return encoded JPEG bytes (None on
+        failure, the _UNCHANGED sentinel when allow_skip is set and the
+        screen content hasn't changed).
+
+        Shared by capture_frame and stream_frames. When TurboJPEG is
+        available and no resize is needed, the raw BGRA buffer from mss
+        goes straight into libjpeg-turbo — no PIL image, no RGB
+        conversion, no intermediate copy.
+        """
+        if self._backend == "pipewire" and self._pw_node_id:
+            # Direct JPEG bytes — skip PIL decode/re-encode
+            data = self._capture_pipewire_bytes(quality=quality)
+            if data is not None and max_width:
+                data = self._downscale_jpeg(data, max_width, quality)
+            return data
+
+        img = None
+        if self._backend in ("mss", "mss-fallback"):
+            try:
+                raw = self._capture_mss_raw()
+            except Exception as e:
+                logger.error(f"Screen capture failed: {e}")
+                return None
+
+            if allow_skip and self._is_unchanged(raw.raw):
+                return _UNCHANGED
+
+            tj = _get_turbojpeg()
+            if tj is not None and not (max_width and raw.width > max_width):
+                try:
+                    if self._tj_encode is None:
+                        # Bound method and static kwargs resolved once;
+                        # only quality varies per frame. The ndarray
+                        # wrap below is a zero-copy view over the mss
+                        # buffer (PyTurboJPEG's encode requires an
+                        # ndarray, so numpy stays in the loop).
+                        # 4:2:0 chroma: screen JPEGs shrink ~30% for
+                        # no visible loss at streaming qualities, and
+                        # decode faster client-side than 4:2:2.
+                        self._tj_encode = tj.encode
+                        self._tj_kwargs = {
+                            "pixel_format": TJPF_BGRX,
+                            "jpeg_subsample": TJSAMP_420,
+                        }
+                    arr = _np.frombuffer(raw.raw, dtype=_np.uint8).reshape(
+                        raw.height, raw.width, 4
+                    )
+                    # IFAST DCT is measurably quicker and visually
+                    # identical at stream qualities; libjpeg-turbo only
+                    # documents it as accurate up to quality 95.
+                    return self._tj_encode(
+                        arr,
+                        quality=quality,
+                        flags=TJFLAG_FASTDCT if quality <= 95 else 0,
+                        **self._tj_kwargs,
+                    )
+                except Exception as e:
+                    logger.warning(f"TurboJPEG encode failed, using PIL: {e}")
+            img = Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
+
+        if img is None:
+            img = self._capture_image()
+        if img is None:
+            return None
 
         if max_width and img.width > max_width:
-            ratio = max_width / img.width
-            new_size = (max_width, int(img.height * ratio))
-            img = img.resize(new_size, Image.LANCZOS)
+            img = self._resize_to_width(img, max_width)
 
         buf = io.BytesIO()
-        img.save(buf, format="JPEG", quality=q, optimize=False)
+        # Explicit 4:2:0 chroma and baseline (non-progressive) output:
+        # ~30% smaller screen-content frames, and baseline decodes
+        # faster in the browser than progressive.
+        img.save(
+            buf, format="JPEG", quality=quality, optimize=False,
+            subsampling=2, progressive=False,
+        )
         return buf.getvalue()
 
+    @staticmethod
+    def _resize_to_width(img: Image.Image, max_width: int) -> Image.Image:
+        """
+        Downscale to max_width in two passes: cheap integer BOX
+        halvings to get within 2x of the target, then one LANCZOS pass
+        over the small remainder. For large ratios this pushes ~1/4 the
+        pixels (or fewer) through the expensive convolution.
+        """
+        while img.width >= max_width * 2:
+            img = img.resize((img.width // 2, img.height // 2), Image.BOX)
+        if img.width > max_width:
+            ratio = max_width / img.width
+            img = img.resize(
+                (max_width, int(img.height * ratio)), Image.LANCZOS
+            )
+        return img
+
+    def _downscale_jpeg(self, data: bytes, max_width: int, quality: int) -> bytes:
+        """
+        Downscale an already-encoded JPEG (PipeWire path) when the
+        client bounds the width. TurboJPEG decodes at a fraction of
+        full size directly in the IDCT via scaling_factor, skipping
+        most of the decode work; PIL's draft() gives the same
+        DCT-domain shortcut as the fallback. Returns the input
+        unchanged if it already fits or nothing can decode it.
+        """
+        tj = _get_turbojpeg()
+        if tj is not None:
+            try:
+                w, _h, _, _ = tj.decode_header(data)
+                if w <= max_width:
+                    return data
+                # Largest scaling factor whose output still fits
+                choices = sorted(
+                    set(tj.scaling_factors), key=lambda f: f[0] / f[1]
+                )
+                factor = choices[0]
+                for f in choices:
+                    if w * f[0] // f[1] <= max_width:
+                        factor = f
+                    else:
+                        break
+                arr = tj.decode(data, scaling_factor=factor)
+                return tj.encode(
+                    arr,
+                    quality=quality,
+                    pixel_format=TJPF_BGR,
+                    jpeg_subsample=TJSAMP_420,
+                    flags=TJFLAG_FASTDCT if quality <= 95 else 0,
+                )
+            except Exception as e:
+                logger.warning(f"TurboJPEG scaled decode failed: {e}")
+
+        try:
+            img = Image.open(io.BytesIO(data))
+            if img.width <= max_width:
+                return data
+            img.draft("RGB", (max_width, max_width))
+            img = self._resize_to_width(img.convert("RGB"), max_width)
+            buf = io.BytesIO()
+            img.save(
+                buf, format="JPEG", quality=quality, optimize=False,
+                subsampling=2, progressive=False,
+            )
+            return buf.getvalue()
+        except Exception as e:
+            logger.warning(f"JPEG downscale failed: {e}")
+            return data
+
     def _capture_image(self) -> Optional[Image.Image]:
         """Capture a screenshot and return as PIL Image."""
         try:
@@ -237,44 +561,66 @@ class ScreenCapture:
             return None
 
     def _capture_pipewire(self) -> Image.Image:
-        """Capture using PipeWire via GStreamer (JPEG output)."""
+        """Capture via the PipeWire helper and decode to a PIL Image."""
+        data = self._capture_pipewire_bytes(quality=self._adaptive_quality)
+        if data is None:
+            raise RuntimeError("No PipeWire frame available")
+        return Image.open(io.BytesIO(data)).convert("RGB")
+
+    def _capture_pipewire_bytes(self, quality=95) -> Optional[bytes]:
+        """
+        Pull one encoded JPEG from the helper's persistent GStreamer
+        pipeline ('grab' over stdin, length-prefixed bytes on stdout).
+        The old path spawned gst-launch-1.0 per frame — a fork/exec and
+        full pipeline negotiation that dominated the frame time.
+        """
         if self._pw_node_id is None:
             self._start_pipewire_session()
 
         if self._pw_node_id is None:
-            raise RuntimeError("No PipeWire session available")
+            return None
 
-        tmp = str(self._tmp_file)
+        if not self._pw_grab_ok:
+            return self._capture_pipewire_oneshot(quality)
 
-        if self._tmp_file.exists():
-            self._tmp_file.unlink()
+        proc = self._pw_session_proc
+        try:
+            proc.stdin.write(b"grab %d\n" % quality)
+            proc.stdin.flush()
+            header = proc.stdout.readline()
+            # Skip handshake lines left over from session startup
+            while header.startswith((b"NODE:", b"SESSION:")):
+                header = proc.stdout.readline()
+
+            if header.startswith(b"FRAME:"):
+                size = int(header[6:])
+                data = proc.stdout.read(size)
+                if len(data) != size:
+                    raise RuntimeError("short frame read")
+                return data
+
+            if header.startswith(b"ERROR:no_pipeline"):
+                logger.warning(
+                    "Helper has no persistent pipeline, "
+                    "falling back to gst-launch per frame"
+                )
+                self._pw_grab_ok = False
+                return self._capture_pipewire_oneshot(quality)
 
-        result = subprocess.run(
-            [
-                "gst-launch-1.0", "-e",
-                "pipewiresrc", f"path={self._pw_node_id}", "num-buffers=1", "!",
-                "videoconvert", "!",
-                "jpegenc", "quality=95", "!",
-                "filesink", f"location={tmp}",
-            ],
-            capture_output=True, timeout=10,
-        )
+            if header.startswith(b"ERROR:"):
+                # Transient (e.g. no sample ready yet) — keep session
+                logger.warning(f"PipeWire grab: {header.decode(errors='replace').strip()}")
+                return None
 
-        if result.returncode != 0 or not self._tmp_file.exists():
+            raise RuntimeError("helper exited")
+        except Exception as e:
+            logger.warning(f"PipeWire grab failed: {e}")
             self._stop_pipewire_session()
-            raise RuntimeError("GStreamer capture failed")
-
-        img = Image.open(tmp).convert("RGB")
-        return img
-
-    def _capture_pipewire_bytes(self, quality=95) -> Optional[bytes]:
-        """Capture using PipeWire and return raw JPEG bytes (no PIL overhead)."""
-        if self._pw_node_id is None:
-            self._start_pipewire_session()
-
-        if self._pw_node_id is None:
             return None
 
+    def _capture_pipewire_oneshot(self, quality=95) -> Optional[bytes]:
+        """One-shot gst-launch capture, used when the helper can't
+        build its own pipeline (no GStreamer Python bindings)."""
         tmp = str(self._tmp_file)
 
         if self._tmp_file.exists():
@@ -297,12 +643,32 @@ class ScreenCapture:
 
         return self._tmp_file.read_bytes()
 
+    def _capture_mss_raw(self):
+        """
+        Grab the raw BGRA ScreenShot from mss (no PIL conversion).
+
+        The mss handle is held for the life of the capture — opening
+        one per frame redid the X11/SHM connection setup 15-30 times a
+        second. The monitor geometry is looked up per grab so monitor
+        switches from the client keep working.
+        """
+        if self._sct is None:
+            import mss
+            self._sct = mss.mss()
+        return self._sct.grab(self._sct.monitors[self.monitor])
+
+    def _close_mss(self):
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+            self._sct = None
+
     def _capture_mss(self) -> Image.Image:
         """Capture using mss (X11)."""
-        import mss
-        with mss.mss() as sct:
-            raw = sct.grab(sct.monitors[self.monitor])
-            return Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
+        raw = self._capture_mss_raw()
+        return Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
 
     def _capture_cli(self, tool: str) -> Image.Image:
         """Capture using a CLI screenshot tool."""
@@ -333,30 +699,30 @@ class ScreenCapture:
         if self._backend == "pipewire":
             self._start_pipewire_session()
 
+        loop = asyncio.get_running_loop()
+
         try:
             while self._running:
                 frame_start = time.monotonic()
 
                 try:
-                    frame_data = None
-
-                    if self._backend == "pipewire" and self._pw_node_id:
-                        # Direct JPEG bytes — skip PIL decode/re-encode
-                        frame_data = self._capture_pipewire_bytes(
-                            quality=self._adaptive_quality,
-                        )
-                    else:
-                        # PIL path for other backends
-                        img = self._capture_image()
-                        if img is not None:
-                            if max_width and img.width > max_width:
-                                ratio = max_width / img.width
-                                new_size = (max_width, int(img.height * ratio))
-                                img = img.resize(new_size, Image.LANCZOS)
-                            buf = io.BytesIO()
-                            img.save(buf, format="JPEG",
-                                     quality=self._adaptive_quality, optimize=False)
-                            frame_data = buf.getvalue()
+                    # Off the event loop: mss and libjpeg release the
+                    # GIL in their C sections, so websocket sends and
+                    # input handling proceed while a frame encodes.
+                    frame_data = await loop.run_in_executor(
+                        self._encode_pool,
+                        self._grab_jpeg,
+                        self._adaptive_quality,
+                        max_width,
+                        True,  # allow_skip
+                    )
+
+                    if frame_data is _UNCHANGED:
+                        # Nothing moved — skip the encode and the send,
+                        # just hold the frame cadence.
+                        error_count = 0
+                        await asyncio.sleep(1.0 / self._adaptive_fps)
+                        continue
 
                     if frame_data is None:
                         error_count += 1
@@ -386,14 +752,13 @@ class ScreenCapture:
 
         finally:
             self._running = False
+            self._close_mss()
             if self._backend == "pipewire":
                 self._stop_pipewire_session()
 
     def _update_adaptive(self, frame_time: float):
         """Adapt FPS to match capture speed. Quality stays fixed."""
         self._frame_times.append(frame_time)
-        if len(self._frame_times) > 30:
-            self._frame_times = self._frame_times[-30:]
         if len(self._frame_times) < 5:
             return
 
@@ -411,6 +776,10 @@ class ScreenCapture:
 
     def stop(self):
         self._running = False
+        self._encode_pool.shutdown(wait=False)
+
+    def __del__(self):
+        self._close_mss()
 
     @property
     def current_quality(self) -> int:
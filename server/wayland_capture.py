@@ -8,6 +8,9 @@ screenshots on GNOME Wayland. This script runs with the SYSTEM Python
 
 Modes:
     session  - Create a ScreenCast session and print the PipeWire node ID.
+               Builds a persistent GStreamer pipeline ending in an
+               appsink; 'grab [quality]' on stdin pulls one encoded
+               JPEG, answered as 'FRAME:<len>\n' + raw bytes on stdout.
                Keeps running until stdin receives 'stop' or process is killed.
     capture  - Capture a single frame from a PipeWire node to a file.
                Usage: wayland_capture.py capture <pw_node_id> <output_path>
@@ -24,6 +27,40 @@ import signal
 import subprocess
 
 
+def pick_pipeline_desc(Gst, node_id, quality):
+    """
+    Choose the JPEG encoder for the persistent pipeline: a hardware
+    element (Intel/AMD VAAPI, then NVIDIA) when present, software
+    jpegenc otherwise. Hardware encode moves the DCT+Huffman work to
+    the media engine at near-zero CPU. DSK_GST_ENCODER=vaapi|nv|sw
+    forces a choice, falling back to detection if it isn't available.
+    """
+    candidates = [
+        # (name, encoder element, raw-video converter element)
+        ('vaapi', 'vaapijpegenc', 'vaapipostproc'),
+        ('nv', 'nvjpegenc', 'videoconvert'),
+        ('sw', 'jpegenc', 'videoconvert'),
+    ]
+    pref = os.environ.get('DSK_GST_ENCODER', '').lower()
+    if pref:
+        preferred = [c for c in candidates if c[0] == pref]
+        candidates = preferred + [c for c in candidates if c[0] != pref]
+
+    for name, enc, convert in candidates:
+        if Gst.ElementFactory.find(enc) is None:
+            continue
+        if Gst.ElementFactory.find(convert) is None:
+            continue
+        desc = (
+            f'pipewiresrc path={node_id} ! {convert} ! '
+            f'{enc} name=enc quality={quality} ! '
+            'appsink name=sink max-buffers=1 drop=true sync=false'
+        )
+        return desc, enc
+
+    raise RuntimeError('no usable JPEG encoder element')
+
+
 def create_screencast_session():
     """
     Create a Mutter ScreenCast session and output the PipeWire node ID.
@@ -35,9 +72,18 @@ def create_screencast_session():
 
     bus = Gio.bus_get_sync(Gio.BusType.SESSION)
 
+    # Call-only proxies skip the GetAll properties round-trip and the
+    # signal match rules; the stream proxy below keeps default flags
+    # because it needs PipeWireStreamAdded and the cached node-id
+    # property.
+    call_flags = (
+        Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
+        | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS
+    )
+
     # Create ScreenCast session
     proxy = Gio.DBusProxy.new_sync(
-        bus, 0, None,
+        bus, call_flags, None,
         'org.gnome.Mutter.ScreenCast',
         '/org/gnome/Mutter/ScreenCast',
         'org.gnome.Mutter.ScreenCast',
@@ -53,7 +99,7 @@ def create_screencast_session():
 
     # Create a session proxy
     session = Gio.DBusProxy.new_sync(
-        bus, 0, None,
+        bus, call_flags, None,
         'org.gnome.Mutter.ScreenCast', session_path,
         'org.gnome.Mutter.ScreenCast.Session', None,
     )
@@ -106,6 +152,31 @@ def create_screencast_session():
     print(f"NODE:{pw_node_id[0]}", flush=True)
     print(f"SESSION:{session_path}", flush=True)
 
+    # Persistent GStreamer pipeline ending in an appsink. Spawning
+    # gst-launch-1.0 per frame (the old path) costs a fork/exec plus
+    # full pipeline negotiation — tens of ms that dominated the frame
+    # time. Here the pipeline negotiates once and each 'grab' just
+    # pulls the newest encoded buffer.
+    pipeline = None
+    appsink = None
+    jpegenc = None
+    current_quality = 80
+    Gst = None
+    try:
+        gi.require_version('Gst', '1.0')
+        from gi.repository import Gst
+        Gst.init(None)
+        desc, enc_name = pick_pipeline_desc(Gst, pw_node_id[0], current_quality)
+        print(f'encoder: {enc_name}', file=sys.stderr, flush=True)
+        pipeline = Gst.parse_launch(desc)
+        jpegenc = pipeline.get_by_name('enc')
+        appsink = pipeline.get_by_name('sink')
+        pipeline.set_state(Gst.State.PLAYING)
+    except Exception as e:
+        pipeline = None
+        # Parent falls back to one-shot gst-launch per frame
+        print(f"NOPIPELINE:{e}", flush=True, file=sys.stderr)
+
     # Keep alive — wait for stop command or signal
     def handle_stop(signum, frame):
         try:
@@ -117,15 +188,50 @@ def create_screencast_session():
     signal.signal(signal.SIGTERM, handle_stop)
     signal.signal(signal.SIGINT, handle_stop)
 
-    # Read stdin for stop command
+    # Serve grab/stop commands from stdin
+    out = sys.stdout.buffer
     try:
         for line in sys.stdin:
-            if line.strip().lower() == 'stop':
+            parts = line.strip().lower().split()
+            if not parts:
+                continue
+            if parts[0] == 'stop':
                 break
+            if parts[0] != 'grab':
+                continue
+
+            if pipeline is None:
+                print("ERROR:no_pipeline", flush=True)
+                continue
+
+            try:
+                if len(parts) > 1:
+                    quality = int(parts[1])
+                    if quality != current_quality:
+                        jpegenc.set_property('quality', quality)
+                        current_quality = quality
+
+                sample = appsink.emit('try-pull-sample', Gst.SECOND)
+                if sample is None:
+                    print("ERROR:no_sample", flush=True)
+                    continue
+
+                gbuf = sample.get_buffer()
+                data = gbuf.extract_dup(0, gbuf.get_size())
+                out.write(b"FRAME:%d\n" % len(data))
+                out.write(data)
+                out.flush()
+            except Exception as e:
+                print(f"ERROR:{e}", flush=True)
     except (EOFError, KeyboardInterrupt):
         pass
 
     # Clean up
+    if pipeline is not None:
+        try:
+            pipeline.set_state(Gst.State.NULL)
+        except Exception:
+            pass
     try:
         session.call_sync('Stop', None, Gio.DBusCallFlags.NONE, 5000, None)
     except Exception:
@@ -22,6 +22,7 @@ Commands:
 import sys
 import json
 import time
+import array
 
 # Button code mappings (Linux evdev)
 BUTTON_MAP = {
@@ -108,6 +109,18 @@ KEYSYM_MAP = {
 }
 
 
+# ASCII fast path for type_text: a 128-slot table indexed by codepoint
+# replaces the per-character dict lookup and lower() call, which
+# dominate large pastes. Printable ASCII codepoints are their own
+# keysyms; whitespace control characters map to their dedicated keys.
+_ASCII_KEYSYMS = array.array('I', [0] * 128)
+for _c in range(32, 127):
+    _ASCII_KEYSYMS[_c] = _c
+_ASCII_KEYSYMS[ord('\n')] = KEYSYM_MAP["enter"]
+_ASCII_KEYSYMS[ord('\r')] = KEYSYM_MAP["enter"]
+_ASCII_KEYSYMS[ord('\t')] = KEYSYM_MAP["tab"]
+
+
 def resolve_keysym(key: str) -> int:
     """Convert a key name or character to an X11 keysym."""
     if isinstance(key, int):
@@ -132,9 +145,17 @@ def main():
 
     bus = Gio.bus_get_sync(Gio.BusType.SESSION)
 
+    # These proxies only place calls — skip the GetAll properties
+    # round-trip and the signal match rules their construction would
+    # otherwise pay for.
+    flags = (
+        Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
+        | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS
+    )
+
     # Create RemoteDesktop session
     proxy = Gio.DBusProxy.new_sync(
-        bus, 0, None,
+        bus, flags, None,
         'org.gnome.Mutter.RemoteDesktop',
         '/org/gnome/Mutter/RemoteDesktop',
         'org.gnome.Mutter.RemoteDesktop', None,
@@ -144,7 +165,7 @@ def main():
     session_path = result.unpack()[0]
 
     session = Gio.DBusProxy.new_sync(
-        bus, 0, None,
+        bus, flags, None,
         'org.gnome.Mutter.RemoteDesktop', session_path,
         'org.gnome.Mutter.RemoteDesktop.Session', None,
     )
@@ -171,12 +192,19 @@ def main():
         args = GLib.Variant.new_tuple(GLib.Variant('i', button_code), GLib.Variant('b', state))
         session.call_sync('NotifyPointerButton', args, Gio.DBusCallFlags.NONE, 1000, None)
 
-    def click(button_code, count=1):
+    # No pacing by default: call_sync already returns only after the
+    # compositor has dispatched the event, and Mutter serialises
+    # processing, so the old fixed 20 ms sleeps (capping clicks and
+    # keys at ~25/s) bought nothing. Commands may opt back in with
+    # "pace_ms" for the rare app that drops fast synthetic input.
+    def click(button_code, count=1, pace=0.0):
         for _ in range(count):
             button_press(button_code, True)
-            time.sleep(0.02)
+            if pace:
+                time.sleep(pace)
             button_press(button_code, False)
-            time.sleep(0.02)
+            if pace:
+                time.sleep(pace)
 
     def scroll(dx, dy):
         # Use discrete scroll for better compatibility
@@ -193,17 +221,32 @@ def main():
         args = GLib.Variant.new_tuple(GLib.Variant('u', keysym), GLib.Variant('b', state))
         session.call_sync('NotifyKeyboardKeysym', args, Gio.DBusCallFlags.NONE, 1000, None)
 
-    def key_press(keysym):
+    def key_event_async(keysym, state):
+        # Queued to GDBus's IO thread without waiting for the reply, so
+        # batches of events go back-to-back on the bus instead of one
+        # round-trip each; the bus preserves ordering and Mutter
+        # serialises processing. Callers flush the connection once at
+        # the end of a batch.
+        args = GLib.Variant.new_tuple(GLib.Variant('u', keysym), GLib.Variant('b', state))
+        session.call('NotifyKeyboardKeysym', args, Gio.DBusCallFlags.NONE, 1000, None, None)
+
+    def key_press(keysym, pace=0.0):
         key_event(keysym, True)
-        time.sleep(0.02)
+        if pace:
+            time.sleep(pace)
         key_event(keysym, False)
 
     def type_text(text):
+        # Pipelined: every press/release is queued without waiting for
+        # its reply, then the connection is flushed once. Throughput is
+        # bounded by bus bandwidth instead of per-key round-trips.
         for char in text:
-            ks = resolve_keysym(char)
+            cp = ord(char)
+            ks = _ASCII_KEYSYMS[cp] if cp < 128 else resolve_keysym(char)
             if ks:
-                key_press(ks)
-                time.sleep(0.02)
+                key_event_async(ks, True)
+                key_event_async(ks, False)
+        bus.flush_sync(None)
 
     # Process commands from stdin
     try:
@@ -212,9 +255,11 @@ def main():
             if not line:
                 continue
 
+            cmd = {}
             try:
                 cmd = json.loads(line)
                 cmd_type = cmd.get("type", "")
+                pace = cmd.get("pace_ms", 0) / 1000.0
 
                 if cmd_type == "stop":
                     break
@@ -228,7 +273,7 @@ def main():
                 elif cmd_type == "mouse_click":
                     btn = BUTTON_MAP.get(cmd.get("button", "left"), BUTTON_MAP["left"])
                     count = cmd.get("count", 1)
-                    click(btn, count)
+                    click(btn, count, pace)
 
                 elif cmd_type == "mouse_down":
                     btn = BUTTON_MAP.get(cmd.get("button", "left"), BUTTON_MAP["left"])
@@ -253,14 +298,14 @@ def main():
                                 key_event(ms, True)
                         # Press key
                         if keysym:
-                            key_press(keysym)
+                            key_press(keysym, pace)
                         # Release modifiers
                         for ms in reversed(mod_syms):
                             if ms:
                                 key_event(ms, False)
                     else:
                         if keysym:
-                            key_press(keysym)
+                            key_press(keysym, pace)
 
                 elif cmd_type == "key_combo":
                     keys = cmd.get("keys", [])
@@ -268,21 +313,29 @@ def main():
                     # Press all
                     for s in syms:
                         if s:
-                            key_event(s, True)
-                    time.sleep(0.02)
+                            key_event_async(s, True)
+                    if pace:
+                        time.sleep(pace)
                     # Release all
                     for s in reversed(syms):
                         if s:
-                            key_event(s, False)
+                            key_event_async(s, False)
+                    bus.flush_sync(None)
 
                 elif cmd_type == "type_text":
                     type_text(cmd.get("text", ""))
 
-                # Send OK response
-                print(json.dumps({"status": "ok"}), flush=True)
+                # Send OK response unless the sender opted out
+                # (fire-and-forget events like mouse motion). The id,
+                # when present, lets the parent match replies to
+                # pipelined commands.
+                if not cmd.get("noack"):
+                    print(json.dumps({"status": "ok", "id": cmd.get("id")}), flush=True)
 
             except Exception as e:
-                print(json.dumps({"status": "error", "message": str(e)}), flush=True)
+                print(json.dumps(
+                    {"status": "error", "message": str(e), "id": cmd.get("id")}
+                ), flush=True)
 
     except (EOFError, KeyboardInterrupt):
         pass